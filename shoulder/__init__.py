@@ -1,5 +1,5 @@
 from .enums import MuscleCoefficientPlots, MuscleSurfacePlots
-from .models import ModelBiorbd, ControlsTypes, IntegrationMethods, MuscleParameter
+from .models import ModelBiorbd, ControlsTypes, IntegrationMethods, MuscleParameter, MuscleField
 
 try:
     from .models import ModelMujoco
@@ -1,4 +1,4 @@
-from .enums import ControlsTypes, IntegrationMethods, MuscleParameter
+from .enums import ControlsTypes, IntegrationMethods, MuscleParameter, MuscleField
 from .model_abstract import ModelAbstract
 from .model_biorbd import ModelBiorbd
 
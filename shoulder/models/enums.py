@@ -9,7 +9,17 @@ class ControlsTypes(Enum):
 class IntegrationMethods(Enum):
     RK4 = "RK4"
     RK45 = "RK45"
+    LSODA = "LSODA"
+    DIFFEQPY_TSIT5 = "DIFFEQPY_TSIT5"
 
 
 class MuscleParameter(Enum):
     OPTIMAL_LENGTH = "optimal_length"
+
+
+class MuscleField(Enum):
+    LENGTH = "length"
+    VELOCITY = "velocity"
+    FLPE = "flpe"
+    FLCE = "flce"
+    FVCE = "fvce"
@@ -12,7 +12,9 @@ def parse_muscle_index(muscle_index: range | slice | int | None, n_muscles: int)
     elif isinstance(muscle_index, int):
         return slice(muscle_index, muscle_index + 1)
     elif isinstance(muscle_index, range):
-        return slice(muscle_index.start, muscle_index.stop)
+        return slice(muscle_index.start, muscle_index.stop, muscle_index.step)
+    elif isinstance(muscle_index, slice):
+        return muscle_index
     else:
         raise ValueError("muscle_index must be an int, a range or a slice")
 
@@ -24,3 +26,19 @@ def concatenate(*args: Vector) -> Vector:
         return np.concatenate(args, axis=0)
     else:
         raise ValueError("Unsupported type for concatenation")
+
+
+def empty(data_type: type, n_rows: int, n_cols: int) -> Vector:
+    if data_type in (SX, MX, DM):
+        return data_type(n_rows, n_cols)
+    elif data_type == np.ndarray:
+        return np.empty((n_rows, n_cols))
+    else:
+        raise ValueError("Unsupported type for allocation")
+
+
+def column_major(value: Vector | None) -> Vector | None:
+    # Frames are read column by column (q[:, i]), so store numpy arrays in Fortran order to keep each frame contiguous
+    if isinstance(value, np.ndarray):
+        return np.asfortranarray(value)
+    return value
@@ -1,6 +1,6 @@
 from abc import ABC, abstractproperty, abstractmethod
 
-from .enums import ControlsTypes, IntegrationMethods, MuscleParameter
+from .enums import ControlsTypes, IntegrationMethods, MuscleParameter, MuscleField
 from .helpers import Vector, Scalar
 
 
@@ -39,19 +39,45 @@ class ModelAbstract(ABC):
         q: Vector,
         qdot: Vector = None,
         muscle_index: int | range | slice | None = None,
+        q_broadcast: bool = False,
     ) -> Vector | tuple[Vector, Vector, Vector]:
         """
         Compute the muscle force-length and force-velocity properties. If qdot is None, only the force-length property
         is computed (that is passive and contractive force-length properties). Otherwise, both the force-length and
-        force-velocity properties are returned.
+        force-velocity properties are returned. If q_broadcast is True and q has a single column, that column is used
+        for every column of qdot.
+        """
+
+    @abstractmethod
+    def evaluate_muscles(
+        self,
+        q: Vector,
+        qdot: Vector = None,
+        emg: Vector = None,
+        fields: tuple[MuscleField, ...] = tuple(MuscleField),
+        muscle_index: int | range | slice | None = None,
+        q_broadcast: bool = False,
+    ) -> dict[MuscleField, Vector]:
+        """
+        Compute all the requested muscle fields (kinematics and force coefficients) in a single pass over the frames,
+        so the muscles are updated only once per frame. The velocity and force-velocity fields require qdot, and the
+        active force-length field requires emg, which has a row for each muscle of the model (whatever muscle_index
+        selects). If q_broadcast is True and q has a single column, that column is used
+        for every column of qdot.
         """
 
     @abstractmethod
     def muscle_force(
-        self, emg: Vector, q: Vector, qdot: Vector, muscle_index: int | range | slice | None = None
+        self,
+        emg: Vector,
+        q: Vector,
+        qdot: Vector,
+        muscle_index: int | range | slice | None = None,
+        q_broadcast: bool = False,
     ) -> Vector:
         """
-        Compute the muscle forces
+        Compute the muscle forces. emg has a row for each muscle of the model, whatever muscle_index selects. If
+        q_broadcast is True and q has a single column, that column is used for every column of qdot.
         """
 
     @abstractmethod
@@ -1,4 +1,7 @@
 from functools import partial
+from operator import methodcaller
+import os
+from typing import Callable
 
 import biorbd
 import biorbd_casadi
@@ -7,17 +10,36 @@ import numpy as np
 from scipy import integrate
 
 
-from .enums import ControlsTypes, IntegrationMethods, MuscleParameter
-from .helpers import Vector, Scalar, parse_muscle_index, concatenate
+from .enums import ControlsTypes, IntegrationMethods, MuscleParameter, MuscleField
+from .helpers import Vector, Scalar, parse_muscle_index, concatenate, empty, column_major
 from .model_abstract import ModelAbstract
 
 
 class ModelBiorbd(ModelAbstract):
-    def __init__(self, model_path: str, use_casadi: bool = False):
+    def __init__(self, model_path: str, use_casadi: bool = False, jit: bool = False):
+        if jit and not use_casadi:
+            raise ValueError("jit is only available when use_casadi is True")
+
         self._use_casadi = use_casadi
+        self._jit = jit
         self.brbd = biorbd_casadi if self._use_casadi else biorbd
+        # Resolve once how the biorbd vectors are converted, instead of testing the backend at each dynamics call
+        self._to_vector = methodcaller("to_mx") if self._use_casadi else methodcaller("to_array")
+        self._upcast_table = {
+            self.brbd.IDEALIZED_ACTUATOR: self.brbd.IdealizedActuator,
+            self.brbd.HILL: self.brbd.HillType,
+            self.brbd.HILL_THELEN: self.brbd.HillThelenType,
+            self.brbd.HILL_DE_GROOTE: self.brbd.HillDeGrooteType,
+        }
         self._model = self.brbd.Model(model_path)
 
+        # Keep a handle on the muscles so they are not fetched (and upcast) from biorbd at each frame
+        self._muscles = [self._model.muscle(j) for j in range(self.n_muscles)]
+        self._muscles_upcast = [self._upcast_muscle(muscle) for muscle in self._muscles]
+
+        # Symbolic functions are built on first use only, as they are costly to create
+        self._casadi_functions: dict[str, casadi.Function] = {}
+
     @property
     def biorbd_model(self) -> biorbd.Model | biorbd_casadi.Model:
         return self._model
@@ -41,28 +63,13 @@ class ModelBiorbd(ModelAbstract):
         if qdot is not None and not isinstance(qdot, data_type):
             raise ValueError("q and qdot must have the same type")
 
-        muscle_index = parse_muscle_index(muscle_index, self.n_muscles)
-
-        n_muscles = len(range(muscle_index.start, muscle_index.stop))
-        data_type = type(q)
-
-        lengths = data_type((n_muscles, q.shape[1]))
-        velocities = data_type((n_muscles, q.shape[1]))
-        for i in range(q.shape[1]):
-            if qdot is None:
-                self._model.updateMuscles(q[:, i], True)
-            else:
-                self._model.updateMuscles(q[:, i], qdot[:, i], True)
-
-            for j in range(self._model.nbMuscleTotal()):
-                lengths[j, i] = self._model.muscle(j).length(self._model, q[:, i], False)
-                if qdot is not None:
-                    velocities[j, i] = self._model.muscle(j).velocity(self._model, q[:, i], qdot[:, i], False)
+        fields = (MuscleField.LENGTH,) if qdot is None else (MuscleField.LENGTH, MuscleField.VELOCITY)
+        out = self.evaluate_muscles(q, qdot, fields=fields, muscle_index=muscle_index)
 
         if qdot is None:
-            return lengths
+            return out[MuscleField.LENGTH]
         else:
-            return lengths, velocities
+            return out[MuscleField.LENGTH], out[MuscleField.VELOCITY]
 
     def muscle_force_coefficients(
         self,
@@ -70,88 +77,141 @@ class ModelBiorbd(ModelAbstract):
         q: Vector,
         qdot: Vector = None,
         muscle_index: int | range | slice | None = None,
+        q_broadcast: bool = False,
     ) -> Vector | tuple[Vector, Vector, Vector]:
-        data_type = type(emg)
-        if not isinstance(q, data_type) or (qdot is not None and not isinstance(qdot, data_type)):
+        fields = (MuscleField.FLPE, MuscleField.FLCE)
+        if qdot is not None:
+            fields += (MuscleField.FVCE,)
+
+        out = self.evaluate_muscles(q, qdot, emg, fields=fields, muscle_index=muscle_index, q_broadcast=q_broadcast)
+        return tuple(out[field] for field in fields)
+
+    def evaluate_muscles(
+        self,
+        q: Vector,
+        qdot: Vector = None,
+        emg: Vector = None,
+        fields: tuple[MuscleField, ...] = tuple(MuscleField),
+        muscle_index: int | range | slice | None = None,
+        q_broadcast: bool = False,
+    ) -> dict[MuscleField, Vector]:
+        data_type = type(q)
+        if (qdot is not None and not isinstance(qdot, data_type)) or (
+            emg is not None and not isinstance(emg, data_type)
+        ):
             raise ValueError("emg, q and qdot must have the same type")
+        if qdot is None and (MuscleField.VELOCITY in fields or MuscleField.FVCE in fields):
+            raise ValueError("qdot must be provided to compute the muscle velocity and force-velocity")
+        if emg is None and MuscleField.FLCE in fields:
+            raise ValueError("emg must be provided to compute the active force-length")
 
-        muscle_index = parse_muscle_index(muscle_index, self.n_muscles)
+        muscle_index = self._resolve_muscle_index(muscle_index)
         if len(q.shape) == 1:
             q = q[:, np.newaxis]
         if qdot is not None and len(qdot.shape) == 1:
             qdot = qdot[:, np.newaxis]
+        if emg is not None and len(emg.shape) == 1:
+            emg = emg[:, np.newaxis]
+        if emg is not None and emg.shape[0] != self.n_muscles:
+            raise ValueError(f"emg should have {self.n_muscles} muscles, but got {emg.shape[0]}")
+        q = column_major(q)
+        qdot = column_major(qdot)
+        emg = column_major(emg)
+
+        n_muscles = muscle_index.size
+        q_broadcast = q_broadcast and qdot is not None and q.shape[1] == 1
+        n_frames = qdot.shape[1] if q_broadcast else q.shape[1]
 
-        n_muscles = len(range(muscle_index.start, muscle_index.stop))
+        if self._use_casadi and data_type == np.ndarray:
+            out = self._evaluate_frames(self._muscles_function(fields, muscle_index), n_frames, q, qdot, emg)
+            return {field: out[field.value] for field in fields}
 
-        out_flpe = data_type((n_muscles, q.shape[1]))
-        out_flce = data_type((n_muscles, q.shape[1]))
-        out_fvce = data_type((n_muscles, q.shape[1]))
-        for i in range(q.shape[1]):
+        out = {field: empty(data_type, n_muscles, n_frames) for field in fields}
+        muscles = [self._muscles[j] for j in muscle_index]
+        muscles_upcast = [self._muscles_upcast[j] for j in muscle_index]
+
+        State = self.brbd.State
+        for i in range(n_frames):
+            q_i = q[:, 0] if q_broadcast else q[:, i]
+
+            # Update the muscles once for all the requested fields, which then only read the values cached by biorbd
             if qdot is None:
-                self._model.updateMuscles(q[:, i], True)
+                self._model.updateMuscles(q_i, True)
             else:
-                self._model.updateMuscles(q[:, i], qdot[:, i], True)
+                self._model.updateMuscles(q_i, qdot[:, i], True)
 
-            for j in range(muscle_index.start, muscle_index.stop):
-                mus = self._upcast_muscle(self._model.muscle(j))
-                activation = self.brbd.State(emg[j, i], emg[j, i])
-                out_flpe[j, i] = mus.FlPE()
-                out_flce[j, i] = mus.FlCE(activation)
-                if qdot is not None:
-                    out_fvce[j, i] = mus.FvCE()
+            if MuscleField.LENGTH in out:
+                out[MuscleField.LENGTH][:, i] = self._column([mus.position().length() for mus in muscles], data_type)
+            if MuscleField.VELOCITY in out:
+                out[MuscleField.VELOCITY][:, i] = self._column(
+                    [mus.position().velocity() for mus in muscles], data_type
+                )
+            if MuscleField.FLPE in out:
+                out[MuscleField.FLPE][:, i] = self._column([mus.FlPE() for mus in muscles_upcast], data_type)
+            if MuscleField.FLCE in out:
+                out[MuscleField.FLCE][:, i] = self._column(
+                    [mus.FlCE(State(emg[j, i], emg[j, i])) for mus, j in zip(muscles_upcast, muscle_index)], data_type
+                )
+            if MuscleField.FVCE in out:
+                out[MuscleField.FVCE][:, i] = self._column([mus.FvCE() for mus in muscles_upcast], data_type)
 
-        if qdot is None:
-            return out_flpe, out_flce
-        else:
-            return out_flpe, out_flce, out_fvce
+        return out
 
     def muscle_force(
-        self, emg: Vector, q: Vector, qdot: Vector, muscle_index: int | range | slice | None = None
+        self,
+        emg: Vector,
+        q: Vector,
+        qdot: Vector,
+        muscle_index: int | range | slice | None = None,
+        q_broadcast: bool = False,
     ) -> Vector:
         data_type = type(emg)
         if not isinstance(q, data_type) or not isinstance(qdot, data_type):
             raise ValueError("emg, q and qdot must have the same type")
         if len(emg.shape) == 1:
             emg = emg[:, np.newaxis]
+        if emg.shape[0] != self.n_muscles:
+            raise ValueError(f"emg should have {self.n_muscles} muscles, but got {emg.shape[0]}")
 
-        muscle_index = parse_muscle_index(muscle_index, self.n_muscles)
+        muscle_index = self._resolve_muscle_index(muscle_index)
         if len(q.shape) == 1:
             q = q[:, np.newaxis]
         if len(qdot.shape) == 1:
             qdot = qdot[:, np.newaxis]
+        q = column_major(q)
+        qdot = column_major(qdot)
+        emg = column_major(emg)
 
-        n_muscles = len(range(muscle_index.start, muscle_index.stop))
-        muscle_index = list(range(*muscle_index.indices(n_muscles)))
+        n_muscles = muscle_index.size
+        q_broadcast = q_broadcast and q.shape[1] == 1
+        n_frames = qdot.shape[1] if q_broadcast else q.shape[1]
 
-        if data_type == casadi.MX or data_type == casadi.SX:
-            out_force = data_type(n_muscles, q.shape[1])
-        else:
-            out_force = data_type((n_muscles, q.shape[1]))
+        if self._use_casadi and data_type == np.ndarray:
+            out = self._evaluate_frames(self._muscle_force_function(), n_frames, q, qdot, emg)
+            return out["forces"][muscle_index, :]
 
-        for i in range(q.shape[1]):
-            if qdot is None:
-                self._model.updateMuscles(q[:, i], True)
-            else:
-                self._model.updateMuscles(q[:, i], qdot[:, i], True)
-
-            for j in range(n_muscles):
-                mus = self._upcast_muscle(self._model.muscle(muscle_index[j]))
-                activation = self.brbd.State(emg[j, i], emg[j, i])
-                force_tp = mus.force(activation)
-                if self._use_casadi:
-                    force_tp = force_tp.to_mx()
-                    if data_type == np.ndarray:
-                        force_tp = casadi.Function("force", [], [force_tp], [], ["force"])()["force"]
-                out_force[j, i] = force_tp
+        out_force = empty(data_type, n_muscles, n_frames)
+
+        State = self.brbd.State
+        for i in range(n_frames):
+            q_i = q[:, 0] if q_broadcast else q[:, i]
+            self._model.updateMuscles(q_i, qdot[:, i], True)
+
+            out_force[:, i] = self._column(
+                [self._muscles_upcast[j].force(State(emg[j, i], emg[j, i])) for j in muscle_index], data_type
+            )
 
         return out_force
 
     def set_muscle_parameters(self, index: int, optimal_length: Scalar) -> None:
-        self._model.muscle(index).characteristics().setOptimalLength(optimal_length)
+        self._muscles[index].characteristics().setOptimalLength(optimal_length)
+
+        # The symbolic functions were built with the previous parameters, they must be rebuilt
+        self._casadi_functions.clear()
 
     def get_muscle_parameter(self, index: int, parameter_to_get: MuscleParameter) -> Scalar:
         if parameter_to_get == MuscleParameter.OPTIMAL_LENGTH:
-            return self._model.muscle(index).characteristics().optimalLength().to_mx()
+            return self._muscles[index].characteristics().optimalLength().to_mx()
         else:
             raise NotImplementedError(f"Parameter {parameter_to_get} not implemented")
 
@@ -182,20 +242,69 @@ class ModelBiorbd(ModelAbstract):
         else:
             raise NotImplementedError(f"Control {controls_type} not implemented")
 
-        if integration_method == IntegrationMethods.RK45:
-            method = "RK45"
-        elif integration_method == IntegrationMethods.RK4:
-            method = "RK4"
+        if self._use_casadi:
+            # Evaluate the dynamics from their symbolic counterpart instead of calling biorbd at each step
+            func = partial(
+                self._evaluate_dynamics_function, func=self._dynamics_function(controls_type), controls=controls
+            )
+
+        if integration_method in (IntegrationMethods.RK45, IntegrationMethods.RK4):
+            # Integrate once and sample the dense output on all the requested times in a single vectorized call
+            t_span = (t[0], t[-1])
+            results = integrate.solve_ivp(
+                fun=func, t_span=t_span, y0=states, method=integration_method.value, dense_output=True
+            )
+            if not results.success:
+                # The dense output would otherwise silently extrapolate past the failure
+                raise RuntimeError(f"{integration_method.value} failed to integrate: {results.message}")
+            y = results.sol(t)
+        elif integration_method == IntegrationMethods.LSODA:
+            jac = None
+            if self._use_casadi:
+                # Only LSODA uses the exact jacobian, so it is not built (nor compiled) for the other methods
+                jac_func = self._dynamics_jacobian_function(controls_type)
+                jac = partial(self._evaluate_dynamics_jacobian, func=jac_func, controls=controls)
+            y = self._integrate_lsoda(func, jac, t, states)
+        elif integration_method == IntegrationMethods.DIFFEQPY_TSIT5:
+            y = self._integrate_diffeqpy(func, t, states)
         else:
             raise NotImplementedError(f"Integration method {integration_method} not implemented")
 
-        t_span = (t[0], t[-1])
-        results = integrate.solve_ivp(fun=func, t_span=t_span, y0=states, method=method, t_eval=t)
-
-        q = results.y[: self.n_q, :]
-        qdot = results.y[self.n_q :, :]
+        q = y[: self.n_q, :]
+        qdot = y[self.n_q :, :]
         return q, qdot
 
+    @staticmethod
+    def _integrate_lsoda(func: Callable, jac: Callable | None, t: np.ndarray, states: np.ndarray) -> np.ndarray:
+        """
+        Integrate with the LSODA solver of scipy.integrate.ode, which keeps its state between the requested times and
+        has a lower overhead per step than solve_ivp. If jac is None, the jacobian is approximated by finite
+        differences
+        """
+        solver = integrate.ode(func, jac).set_integrator("lsoda")
+        solver.set_initial_value(states, t[0])
+
+        y = np.empty((states.shape[0], t.shape[0]))
+        y[:, 0] = states
+        for i in range(1, t.shape[0]):
+            y[:, i] = solver.integrate(t[i])
+            if not solver.successful():
+                raise RuntimeError(f"LSODA failed to integrate at t={t[i]}")
+        return y
+
+    @staticmethod
+    def _integrate_diffeqpy(func: Callable, t: np.ndarray, states: np.ndarray) -> np.ndarray:
+        """
+        Integrate with the Tsit5 solver of DifferentialEquations.jl, through diffeqpy
+        """
+        from diffeqpy import de
+
+        problem = de.ODEProblem(lambda x, p, t_: func(t_, np.asarray(x)), states, (t[0], t[-1]))
+        solution = de.solve(problem, de.Tsit5(), saveat=t)
+        if len(solution.t) != len(t):
+            raise RuntimeError(f"DIFFEQPY_TSIT5 failed to integrate: {solution.retcode}")
+        return np.array(solution.u).T
+
     def forward_dynamics(
         self,
         q: Vector,
@@ -232,7 +341,7 @@ class ModelBiorbd(ModelAbstract):
         # for k in range(self._model.nbMuscles()):
         #     states[k].setActivation(emg[k])
         tau = self._model.muscularJointTorque(states, q, qdot)
-        tau = tau.to_mx() if self._use_casadi else tau.to_array()
+        tau = self._to_vector(tau)
 
         return self._forward_dynamics(t, x, tau)
 
@@ -240,10 +349,64 @@ class ModelBiorbd(ModelAbstract):
         q = x[: self.n_q]
         qdot = x[self.n_q :]
         qddot = self._model.ForwardDynamics(q, qdot, tau)
-        qddot = qddot.to_mx() if self._use_casadi else qddot.to_array()
+        qddot = self._to_vector(qddot)
 
         return concatenate(qdot, qddot)
 
+    def _dynamics_function(self, controls_type: ControlsTypes) -> casadi.Function:
+        """
+        Get the symbolic function of the state derivative, taking the states and the controls as inputs
+        """
+        name = f"dynamics_{controls_type.name.lower()}"
+        if name not in self._casadi_functions:
+            x, u, xdot = self._dynamics_expressions(controls_type)
+            self._casadi_functions[name] = casadi.Function(
+                name, [x, u], [xdot], ["x", "u"], ["xdot"], self._dynamics_options()
+            )
+        return self._casadi_functions[name]
+
+    def _dynamics_jacobian_function(self, controls_type: ControlsTypes) -> casadi.Function:
+        """
+        Get the symbolic function of the jacobian of the state derivative with respect to the states, taking the states
+        and the controls as inputs
+        """
+        name = f"dynamics_{controls_type.name.lower()}_jacobian"
+        if name not in self._casadi_functions:
+            x, u, xdot = self._dynamics_expressions(controls_type)
+            self._casadi_functions[name] = casadi.Function(
+                name, [x, u], [casadi.jacobian(xdot, x)], ["x", "u"], ["jacobian"], self._dynamics_options()
+            )
+        return self._casadi_functions[name]
+
+    def _dynamics_expressions(self, controls_type: ControlsTypes) -> tuple[casadi.MX, casadi.MX, casadi.MX]:
+        """
+        Build the symbolic states, controls and state derivative
+        """
+        x = casadi.MX.sym("x", 2 * self.n_q, 1)
+        if controls_type == ControlsTypes.EMG:
+            u = casadi.MX.sym("emg", self.n_muscles, 1)
+            xdot = self._forward_dynamics_muscles([], x, u)
+        elif controls_type == ControlsTypes.TORQUE:
+            u = casadi.MX.sym("tau", self.n_q, 1)
+            xdot = self._forward_dynamics([], x, u)
+        else:
+            raise NotImplementedError(f"Control {controls_type} not implemented")
+        return x, u, xdot
+
+    def _dynamics_options(self) -> dict:
+        """
+        The integrator calls the dynamics functions at each step, so compile them to native code if requested
+        """
+        return {"jit": True, "compiler": "shell", "jit_options": {"flags": ["-O3"]}} if self._jit else {}
+
+    @staticmethod
+    def _evaluate_dynamics_function(t: float, x: np.ndarray, func: casadi.Function, controls: np.ndarray) -> np.ndarray:
+        return func(x, controls).full()[:, 0]
+
+    @staticmethod
+    def _evaluate_dynamics_jacobian(t: float, x: np.ndarray, func: casadi.Function, controls: np.ndarray) -> np.ndarray:
+        return func(x, controls).full()
+
     def animate(self, states: list[Vector]) -> None:
         import bioviz
 
@@ -258,6 +421,105 @@ class ModelBiorbd(ModelAbstract):
         viz.set_camera_roll(np.pi / 2)
         viz.exec()
 
+    def _resolve_muscle_index(self, muscle_index: int | range | slice | None) -> np.ndarray:
+        """
+        Get the indices of the requested muscles as an array of ints
+        """
+        muscle_index = parse_muscle_index(muscle_index, self.n_muscles)
+        return np.arange(*muscle_index.indices(self.n_muscles))
+
+    def _column(self, values: list[Scalar], data_type: type) -> Vector:
+        """
+        Stack the values of all the muscles for one frame, so they can be written in a single column assignment
+        """
+        if data_type == np.ndarray:
+            return np.fromiter(values, dtype=np.float64, count=len(values))
+        return casadi.vertcat(*[value.to_mx() for value in values])
+
+    def _mapped_function(self, func: casadi.Function, n_frames: int) -> casadi.Function:
+        """
+        Get the function evaluating func on n_frames frames at once, the frames being dispatched on parallel threads.
+        It is kept for each number of frames, as creating the map is not free
+        """
+        name = f"{func.name()}_map_{n_frames}"
+        if name not in self._casadi_functions:
+            self._casadi_functions[name] = func.map(n_frames, "thread", min(8, os.cpu_count() or 1))
+        return self._casadi_functions[name]
+
+    def _evaluate_frames(
+        self, func: casadi.Function, n_frames: int, q: np.ndarray, qdot: np.ndarray | None, emg: np.ndarray | None
+    ) -> dict[str, np.ndarray]:
+        """
+        Evaluate all the frames at once from the symbolic function instead of calling biorbd for each frame (a single
+        q column is repeated by map). The missing qdot and emg are set to zero
+        """
+        out = self._mapped_function(func, n_frames)(
+            q=q,
+            qdot=np.zeros(q.shape) if qdot is None else qdot,
+            emg=np.zeros((self.n_muscles, 1)) if emg is None else emg,
+        )
+        return {key: np.array(value) for key, value in out.items()}
+
+    def _muscles_function(self, fields: tuple[MuscleField, ...], muscle_index: np.ndarray) -> casadi.Function:
+        """
+        Get the symbolic function that computes the requested MuscleField of the requested muscles for one frame. It is
+        kept for each set of fields and muscles, so the unused fields and muscles are never built nor evaluated
+        """
+        name = f"muscles_{'_'.join(field.value for field in fields)}"
+        if muscle_index.size != self.n_muscles:
+            name += f"_{'_'.join(str(j) for j in muscle_index)}"
+
+        if name not in self._casadi_functions:
+            q = casadi.MX.sym("q", self.n_q, 1)
+            qdot = casadi.MX.sym("qdot", self.n_q, 1)
+            emg = casadi.MX.sym("emg", self.n_muscles, 1)
+            self._model.updateMuscles(q, qdot, True)
+
+            muscle_index = muscle_index.tolist()
+            muscles = [self._muscles[j] for j in muscle_index]
+            muscles_upcast = [self._muscles_upcast[j] for j in muscle_index]
+
+            State = self.brbd.State
+            out = []
+            for field in fields:
+                if field == MuscleField.LENGTH:
+                    values = [mus.position().length() for mus in muscles]
+                elif field == MuscleField.VELOCITY:
+                    values = [mus.position().velocity() for mus in muscles]
+                elif field == MuscleField.FLPE:
+                    values = [mus.FlPE() for mus in muscles_upcast]
+                elif field == MuscleField.FLCE:
+                    values = [mus.FlCE(State(emg[j], emg[j])) for mus, j in zip(muscles_upcast, muscle_index)]
+                elif field == MuscleField.FVCE:
+                    values = [mus.FvCE() for mus in muscles_upcast]
+                else:
+                    raise NotImplementedError(f"Field {field} not implemented")
+                out.append(casadi.vertcat(*[value.to_mx() for value in values]))
+
+            self._casadi_functions[name] = casadi.Function(
+                name, [q, qdot, emg], out, ["q", "qdot", "emg"], [field.value for field in fields]
+            )
+        return self._casadi_functions[name]
+
+    def _muscle_force_function(self) -> casadi.Function:
+        """
+        Get the symbolic function that computes the forces of all the muscles for one frame
+        """
+        if "muscle_force" not in self._casadi_functions:
+            q = casadi.MX.sym("q", self.n_q, 1)
+            qdot = casadi.MX.sym("qdot", self.n_q, 1)
+            emg = casadi.MX.sym("emg", self.n_muscles, 1)
+            self._model.updateMuscles(q, qdot, True)
+
+            State = self.brbd.State
+            forces = casadi.vertcat(
+                *[mus.force(State(emg[j], emg[j])).to_mx() for j, mus in enumerate(self._muscles_upcast)]
+            )
+            self._casadi_functions["muscle_force"] = casadi.Function(
+                "muscle_force", [q, qdot, emg], [forces], ["q", "qdot", "emg"], ["forces"]
+            )
+        return self._casadi_functions["muscle_force"]
+
     def _upcast_muscle(
         self, muscle: biorbd.Muscle | biorbd_casadi.Muscle
     ) -> (
@@ -269,13 +531,6 @@ class ModelBiorbd(ModelAbstract):
         | biorbd_casadi.HillDeGrooteType
     ):
         muscle_type_id = muscle.type()
-        if muscle_type_id == self.brbd.IDEALIZED_ACTUATOR:
-            return self.brbd.IdealizedActuator(muscle)
-        elif muscle_type_id == self.brbd.HILL:
-            return self.brbd.HillType(muscle)
-        elif muscle_type_id == self.brbd.HILL_THELEN:
-            return self.brbd.HillThelenType(muscle)
-        elif muscle_type_id == self.brbd.HILL_DE_GROOTE:
-            return self.brbd.HillDeGrooteType(muscle)
-        else:
+        if muscle_type_id not in self._upcast_table:
             raise ValueError(f"Muscle type {muscle_type_id} not supported")
+        return self._upcast_table[muscle_type_id](muscle)
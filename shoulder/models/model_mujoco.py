@@ -1,7 +1,7 @@
 import mujoco
 import numpy as np
 
-from .enums import ControlsTypes, IntegrationMethods, MuscleParameter
+from .enums import ControlsTypes, IntegrationMethods, MuscleParameter, MuscleField
 from .helpers import Vector, Scalar, parse_muscle_index
 from .model_abstract import ModelAbstract
 
@@ -30,7 +30,7 @@ class ModelMujoco(ModelAbstract):
             raise ValueError("ModelMujoco.muscles_kinematics only supports numpy arrays")
 
         muscle_index = parse_muscle_index(muscle_index, self.n_muscles)
-        n_muscles = len(range(muscle_index.start, muscle_index.stop))
+        n_muscles = len(range(*muscle_index.indices(self.n_muscles)))
 
         data = mujoco.MjData(self._model)
         mujoco.mj_resetData(self._model, data)
@@ -39,8 +39,8 @@ class ModelMujoco(ModelAbstract):
         if qdot is None:
             qdot = np.zeros_like(q)
 
-        length = np.ndarray((n_muscles, q.shape[1]))
-        velocity = np.ndarray((n_muscles, q.shape[1]))
+        length = np.empty((n_muscles, q.shape[1]))
+        velocity = np.empty((n_muscles, q.shape[1]))
         for i, (q_tp, qdot_tp) in enumerate(zip(q.T, qdot.T)):
             mujoco.mj_resetData(self._model, data)
             data.qpos = q_tp
@@ -60,21 +60,41 @@ class ModelMujoco(ModelAbstract):
         q: Vector,
         qdot: Vector = None,
         muscle_index: int | range | slice | None = None,
+        q_broadcast: bool = False,
     ) -> Vector | tuple[Vector, Vector, Vector]:
         raise ValueError("muscle_force_coefficients is not compatible with Mujoco models")
 
+    def evaluate_muscles(
+        self,
+        q: Vector,
+        qdot: Vector = None,
+        emg: Vector = None,
+        fields: tuple[MuscleField, ...] = tuple(MuscleField),
+        muscle_index: int | range | slice | None = None,
+        q_broadcast: bool = False,
+    ) -> dict[MuscleField, Vector]:
+        raise ValueError("evaluate_muscles is not compatible with Mujoco models")
+
     def muscle_force(
-        self, emg: Vector, q: Vector, qdot: Vector, muscle_index: int | range | slice | None = None
+        self,
+        emg: Vector,
+        q: Vector,
+        qdot: Vector,
+        muscle_index: int | range | slice | None = None,
+        q_broadcast: bool = False,
     ) -> Vector:
         if not isinstance(emg, np.ndarray) or not isinstance(q, np.ndarray) or not isinstance(qdot, np.ndarray):
             raise ValueError("ModelMujoco.muscle_force only supports numpy arrays")
+        if q_broadcast and q.shape[1] == 1:
+            # A read-only view, so the column is not copied for each qdot
+            q = np.broadcast_to(q, (q.shape[0], qdot.shape[1]))
 
         muscle_index = parse_muscle_index(muscle_index, self.n_muscles)
-        n_muscles = len(range(muscle_index.start, muscle_index.stop))
+        n_muscles = len(range(*muscle_index.indices(self.n_muscles)))
 
         data = mujoco.MjData(self._model)
 
-        force = np.ndarray((n_muscles, q.shape[1]))
+        force = np.empty((n_muscles, q.shape[1]))
         for i, (emg_tp, q_tp, qdot_tp) in enumerate(zip(emg.T, q.T, qdot.T)):
             mujoco.mj_resetData(self._model, data)
             data.qpos = q_tp
@@ -2,7 +2,8 @@ import numpy as np
 from matplotlib import pyplot as plt
 
 from .enums import MuscleCoefficientPlots, MuscleSurfacePlots
-from .models import ModelAbstract
+from .models import ModelAbstract, MuscleField
+from .models.helpers import column_major
 
 
 class Plotter:
@@ -22,13 +23,17 @@ class Plotter:
         # Store the data
         self._model = model
         self._t = t
-        self._q = q
-        self._qdot = qdot
-        self._tau = tau
-        self._emg = emg
+        self._q = column_major(q)
+        self._qdot = column_major(qdot)
+        self._tau = column_major(tau)
+        self._emg = column_major(emg)
         self._muscle_index = muscle_index
         self._dof_index = dof_index
 
+        # Surfaces are costly to compute, so keep them in case they are plotted again
+        self._meshgrid = None
+        self._surfaces: dict[MuscleSurfacePlots, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
     def plot_muscle_surface(self, plots: list[MuscleSurfacePlots], axis_id: int):
         if isinstance(plots, MuscleSurfacePlots):
             plots = [plots]
@@ -47,46 +52,66 @@ class Plotter:
         if self._q is None or self._qdot is None or self._emg is None:
             raise ValueError("q, qdot and emg must be provided to plot the muscle force coefficients surface")
 
-        # Draw the surface of the force-length-velocity relationship for each model
-        fig = plt.figure("Force-Length-Velocity relationship (coefficients)")
-        length, velocity = self._model.muscles_kinematics(self._q, self._qdot)
-
-        x, y = np.meshgrid(self._q[self._dof_index, :], self._qdot[self._dof_index, :])
-        z = np.ndarray((velocity.shape[1], length.shape[1]))
-
-        for i in range(length.shape[1]):
-            q_rep = np.repeat(self._q[:, i : i + 1], self._qdot.shape[1], axis=1)
-            _, flce, fvce = self._model.muscle_force_coefficients(self._emg, q_rep, self._qdot, self._muscle_index)
-            z[:, i] = flce * fvce
-
-        ax = fig.add_subplot(axis_id, projection="3d")
-        ax.plot_surface(x, y, z, cmap="viridis")
-        ax.set_xlabel("q")
-        ax.set_ylabel("qdot")
-        ax.set_zlabel("Force (normalized)")
-        ax.set_zlim(0, ax.get_zlim()[1])
-        ax.set_title(self._model.name)
+        self._plot_surface(
+            axis_id,
+            "Force-Length-Velocity relationship (coefficients)",
+            "Force (normalized)",
+            *self._get_surface(MuscleSurfacePlots.COEFFICIENTS),
+        )
 
     def plot_muscle_force_surface(self, axis_id: int):
         if self._q is None or self._qdot is None or self._emg is None:
             raise ValueError("q, qdot and emg must be provided to plot the muscle force surface")
 
-        # Draw the surface of the force-length-velocity relationship for each model
-        fig = plt.figure("Force-Length-Velocity relationship (maximal force)")
-        length, velocity = self._model.muscles_kinematics(self._q, self._qdot)
+        self._plot_surface(
+            axis_id,
+            "Force-Length-Velocity relationship (maximal force)",
+            "Force (N)",
+            *self._get_surface(MuscleSurfacePlots.FORCE),
+        )
 
-        x, y = np.meshgrid(self._q[self._dof_index, :], self._qdot[self._dof_index, :])
-        z = np.ndarray((velocity.shape[1], length.shape[1]))
+    def _get_surface(self, plot: MuscleSurfacePlots) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the (q, qdot) grid and the force computed on it. They are computed once per plot type, as the data of
+        the plotter never change after its creation
+        """
+        if plot in self._surfaces:
+            return self._surfaces[plot]
+
+        if self._meshgrid is None:
+            self._meshgrid = np.meshgrid(self._q[self._dof_index, :], self._qdot[self._dof_index, :])
+        x, y = self._meshgrid
+
+        z = np.ndarray((self._qdot.shape[1], self._q.shape[1]))
+        for i in range(self._q.shape[1]):
+            if plot == MuscleSurfacePlots.COEFFICIENTS:
+                out = self._model.evaluate_muscles(
+                    self._q[:, i : i + 1],
+                    self._qdot,
+                    self._emg,
+                    fields=(MuscleField.FLCE, MuscleField.FVCE),
+                    muscle_index=self._muscle_index,
+                    q_broadcast=True,
+                )
+                z[:, i] = out[MuscleField.FLCE] * out[MuscleField.FVCE]
+            elif plot == MuscleSurfacePlots.FORCE:
+                z[:, i] = self._model.muscle_force(
+                    self._emg, self._q[:, i : i + 1], self._qdot, self._muscle_index, q_broadcast=True
+                )
+            else:
+                raise NotImplementedError(f"Plot {plot} not implemented")
 
-        for i in range(length.shape[1]):
-            q_rep = np.repeat(self._q[:, i : i + 1], self._qdot.shape[1], axis=1)
-            z[:, i] = self._model.muscle_force(self._emg, q_rep, self._qdot, self._muscle_index)
+        self._surfaces[plot] = x, y, z
+        return self._surfaces[plot]
 
+    def _plot_surface(self, axis_id: int, title: str, z_label: str, x: np.ndarray, y: np.ndarray, z: np.ndarray):
+        # Draw the surface of the force-length-velocity relationship for each model
+        fig = plt.figure(title)
         ax = fig.add_subplot(axis_id, projection="3d")
         ax.plot_surface(x, y, z, cmap="viridis")
         ax.set_xlabel("q")
         ax.set_ylabel("qdot")
-        ax.set_zlabel("Force (N)")
+        ax.set_zlabel(z_label)
         ax.set_zlim(0, ax.get_zlim()[1])
         ax.set_title(self._model.name)
 
@@ -94,40 +119,29 @@ class Plotter:
         if self._t is None:
             raise ValueError("t must be provided to plot the movement")
 
-        plt.figure()
         n_subplots = sum(x is not None for x in [self._q, self._qdot, self._tau, self._emg])
-        subplot_index = 1
+        _, axes = plt.subplots(n_subplots, 1, sharex=True, squeeze=False)
+        axes = iter(axes[:, 0])
 
         if self._q is not None:
-            plt.subplot(n_subplots, 1, subplot_index)
-            plt.plot(self._t, self._q.T)
-            plt.title("Position")
-            plt.xlabel("Time")
-            plt.ylabel("Q")
-            subplot_index += 1
+            ax = next(axes)
+            ax.plot(self._t, self._q.T)
+            ax.set(title="Position", xlabel="Time", ylabel="Q")
 
         if self._qdot is not None:
-            plt.subplot(n_subplots, 1, subplot_index)
-            plt.plot(self._t, self._qdot.T)
-            plt.title("Velocity")
-            plt.xlabel("Time")
-            plt.ylabel("Qdot")
-            subplot_index += 1
+            ax = next(axes)
+            ax.plot(self._t, self._qdot.T)
+            ax.set(title="Velocity", xlabel="Time", ylabel="Qdot")
 
         if self._tau is not None:
-            plt.subplot(n_subplots, 1, subplot_index)
-            plt.step(self._t[[0, -1]], self._tau[np.newaxis, :][[0, 0], :])
-            plt.title("Torque")
-            plt.xlabel("Time")
-            plt.ylabel("Tau")
-            subplot_index += 1
+            ax = next(axes)
+            ax.step(self._t[[0, -1]], self._tau[np.newaxis, :][[0, 0], :])
+            ax.set(title="Torque", xlabel="Time", ylabel="Tau")
 
         if self._emg is not None:
-            plt.subplot(n_subplots, 1, subplot_index)
-            plt.step(self._t[[0, -1]], self._emg[np.newaxis, :][[0, 0], :])
-            plt.title("EMG")
-            plt.xlabel("Time")
-            plt.ylabel("EMG")
+            ax = next(axes)
+            ax.step(self._t[[0, -1]], self._emg[np.newaxis, :][[0, 0], :])
+            ax.set(title="EMG", xlabel="Time", ylabel="EMG")
 
     @staticmethod
     def show():
@@ -145,15 +159,16 @@ class Plotter:
         if len(plots) == 0 or (len(plots) == 1 and plots[0] == MuscleCoefficientPlots.NONE):
             return None
 
-        flpe, flce, fvce = self._model.muscle_force_coefficients(
-            self._emg, self._q, self._qdot, muscle_index=self._muscle_index
-        )
+        # Update the muscles once per frame for both the coefficients and the kinematics
+        out = self._model.evaluate_muscles(self._q, self._qdot, self._emg, muscle_index=self._muscle_index)
+        flpe, flce, fvce = out[MuscleField.FLPE], out[MuscleField.FLCE], out[MuscleField.FVCE]
+        length, velocity = out[MuscleField.LENGTH], out[MuscleField.VELOCITY]
+
         y_left = []
         y_left.append(flpe)
         y_left.append(flce)
         y_left.append(fvce)
 
-        length, velocity = self._model.muscles_kinematics(self._q, self._qdot, self._muscle_index)
         y_right = []
         y_right.append(length)
         y_right.append(length)